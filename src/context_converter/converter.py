@@ -2,27 +2,68 @@
 This script defines a class HTMLToMarkdownConverter that is responsible for converting HTML content to Markdown format and processing text embeddings. It uses the transformers library to load a pretrained model for generating embeddings, and the beautifulsoup4 and markdownify libraries to parse and convert HTML content to Markdown. The class also includes methods for removing redundant data based on semantic similarity, and for curating the HTML content by removing specified elements and tags.
 """
 
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from bs4 import BeautifulSoup, Tag
+from markdownify import MarkdownConverter
 from transformers import AutoTokenizer, AutoModel
+import soupsieve as sv
 import torch
 import logging
+import sys
+
+
+# CSS selectors for page chrome (navigation, ads, banners) removed before conversion
+REMOVE_SELECTORS = (
+    "header",
+    "footer",
+    "nav",
+    ".navbar",
+    ".menu",
+    ".footer-links",
+    "#sidebar",
+    "#ad-container",
+    'div[class*="cookie"], div[class*="banner"]',
+    "aside",
+    ".pagination",
+    "form",
+)
 
 
 class HTMLToMarkdownConverter:
-    def __init__(self, strip_tags=None, convert_links=True):
+    def __init__(self, strip_tags=None, convert_links=True, remove_selectors=None):
         """
         Initializes the object with optional parameters.
 
         Args:
             strip_tags (list): List of tags to strip from the text. Defaults to ["script", "style", "meta"].
             convert_links (bool): Flag to indicate whether to convert links. Defaults to True.
+            remove_selectors (list): CSS selectors for elements to remove before conversion. Defaults to REMOVE_SELECTORS.
 
         Returns:
             None
         """
         self.strip_tags = strip_tags or ["script", "style", "meta"]
         self.convert_links = convert_links
+        self._strip_tag_names = frozenset(
+            sys.intern(tag.lower()) for tag in self.strip_tags
+        )
+        self.remove_selectors = remove_selectors or REMOVE_SELECTORS
+        # Bare tag-name selectors are matched with a set lookup; only the rest are
+        # compiled, once, so conversions never re-parse the selectors
+        selectors = [selector.strip() for selector in self.remove_selectors]
+        self._remove_tag_names = frozenset(
+            sys.intern(selector.lower()) for selector in selectors if selector.isalnum()
+        )
+        complex_selectors = [
+            selector for selector in selectors if not selector.isalnum()
+        ]
+        self._compiled_selectors = (
+            sv.compile(", ".join(complex_selectors)) if complex_selectors else None
+        )
+        # Every tag name curation removes outright, stripped or selected
+        self._removable_tag_names = self._strip_tag_names | self._remove_tag_names
+        self.markdown_converter = MarkdownConverter(
+            strip_tags=self.strip_tags, convert_links=self.convert_links
+        )
         self.tokenizer, self.model = self._initialize_embedding_model()
 
     def _initialize_embedding_model(self):
@@ -48,11 +89,11 @@ class HTMLToMarkdownConverter:
             torch.Tensor: The result of mean pooling.
         """
         token_embeddings = model_output[0]
-        input_mask_expanded = (
-            attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
-        )
-        sum_embeddings = torch.sum(token_embeddings * input_mask_expanded, 1)
-        sum_mask = torch.clamp(input_mask_expanded.sum(1), min=1e-9)
+        # Broadcast the mask over the hidden dimension instead of materializing an
+        # expanded copy, and count tokens once per sequence rather than per dimension
+        input_mask = attention_mask.unsqueeze(-1).to(token_embeddings.dtype)
+        sum_embeddings = torch.sum(token_embeddings * input_mask, 1)
+        sum_mask = torch.clamp(input_mask.sum(1), min=1e-9)
         return sum_embeddings / sum_mask
 
     def _process_embeddings(self, lines, batch_size=16):
@@ -72,16 +113,15 @@ class HTMLToMarkdownConverter:
             encoded_input = self.tokenizer(
                 batch, padding=True, truncation=True, return_tensors="pt"
             )
-            with torch.no_grad():
+            # inference_mode also skips version counting and view tracking
+            with torch.inference_mode():
                 model_output = self.model(**encoded_input)
-            batch_embeddings = self.mean_pooling(
-                model_output, encoded_input["attention_mask"]
-            )
-            batched_embeddings.extend(batch_embeddings)
+                batch_embeddings = self.mean_pooling(
+                    model_output, encoded_input["attention_mask"]
+                )
+            batched_embeddings.append(batch_embeddings)
 
-        return torch.nn.functional.normalize(
-            torch.stack(batched_embeddings), p=2, dim=1
-        )
+        return torch.nn.functional.normalize(torch.cat(batched_embeddings), p=2, dim=1)
 
     def _remove_redundant_data(self, embeddings, lines):
         """
@@ -94,13 +134,11 @@ class HTMLToMarkdownConverter:
         Returns:
             str: A string representing the cleaned lines of text with redundant data removed.
         """
+        # Similarity of every line to its predecessor, computed in one batched call
+        similarities = torch.cosine_similarity(embeddings[1:], embeddings[:-1], dim=1)
+        keep = (similarities < 0.86899).tolist()  # Threshold for redundancy
         cleaned_lines = [lines[0]]  # Always include the first line
-        for i in range(1, len(lines)):
-            similarity = torch.cosine_similarity(
-                embeddings[i].unsqueeze(0), embeddings[i - 1].unsqueeze(0)
-            )
-            if similarity.item() < 0.86899:  # Threshold for redundancy
-                cleaned_lines.append(lines[i])
+        cleaned_lines.extend(line for line, kept in zip(lines[1:], keep) if kept)
         return "\n".join(cleaned_lines)
 
     def convert(self, html_content):
@@ -115,14 +153,16 @@ class HTMLToMarkdownConverter:
         Raises:
             Exception: If an error occurs during the conversion process.
         """
+        if not html_content or html_content.isspace():
+            # Nothing to parse, render or embed
+            return ""
         try:
-            curated_html = self._curate_content(html_content)
-            markdown_content = md(
-                curated_html,
-                strip_tags=self.strip_tags,
-                convert_links=self.convert_links,
-            ).strip()
+            soup = self._curate_soup(html_content)
+            markdown_content = self.markdown_converter.convert_soup(soup).strip()
             lines = markdown_content.split("\n")
+            if len(lines) < 2:
+                # A single line has nothing to compare against; skip the model
+                return markdown_content
             embeddings = self._process_embeddings(lines)
             return self._remove_redundant_data(embeddings, lines)
         except Exception as e:
@@ -131,18 +171,37 @@ class HTMLToMarkdownConverter:
 
     def _curate_content(self, html):
         """
-        Curates the HTML content by parsing it with BeautifulSoup, removing selectors, 
-        and stripping tags. Returns the curated HTML content as a string. 
+        Curates the HTML content and returns it as a string. Returns the original HTML
+        if an error occurs.
         """
         try:
-            soup = BeautifulSoup(html, "html.parser")
-            self._remove_selectors(soup)
-            self._strip_tags(soup)
-            return str(soup)
+            return str(self._parse_and_curate(html))
         except Exception as e:
             logging.error("Error in curating HTML content: %s", e)
             return html
 
+    def _curate_soup(self, html):
+        """
+        Curates the HTML content and returns the curated BeautifulSoup object, which is
+        handed to markdownify directly instead of being serialized and parsed again.
+        If curation fails, the original HTML is parsed with html.parser and returned
+        uncurated, matching the earlier fallback of rendering the raw HTML.
+        """
+        try:
+            return self._parse_and_curate(html)
+        except Exception as e:
+            logging.error("Error in curating HTML content: %s", e)
+            return BeautifulSoup(html, "html.parser")
+
+    def _parse_and_curate(self, html):
+        """
+        Parses the HTML content with BeautifulSoup (lxml parser), then removes selectors
+        and strips tags in a single pass over the tree. Errors are propagated.
+        """
+        soup = BeautifulSoup(html, "lxml")
+        self._decompose_matching(soup, self._should_remove)
+        return soup
+
     def _remove_selectors(self, soup):
         """
         Remove specified selectors from the given BeautifulSoup object.
@@ -153,23 +212,52 @@ class HTMLToMarkdownConverter:
         Returns:
         - None
         """
-        selectors = [
-            "header",
-            "footer",
-            "nav",
-            ".navbar",
-            ".menu",
-            ".footer-links",
-            "#sidebar",
-            "#ad-container",
-            'div[class*="cookie"], div[class*="banner"]',
-            "aside",
-            ".pagination",
-            "form",
-        ]
-        for selector in selectors:
-            for element in soup.select(selector):
-                element.decompose()
+        self._decompose_matching(soup, self._matches_selector)
+
+    def _matches_selector(self, tag):
+        """
+        Check whether a tag matches any of the removal selectors. The cheap tag-name
+        lookup runs first; soupsieve is only consulted when it fails.
+
+        Parameters:
+            tag (Tag): The tag to check.
+
+        Returns:
+            bool: True if the tag should be removed.
+        """
+        if tag.name in self._remove_tag_names:
+            return True
+        return self._matches_compiled_selectors(tag)
+
+    def _should_remove(self, tag):
+        """
+        Check whether curation should remove a tag, either because it is a strip tag
+        or because it matches a removal selector. Both tag-name sets are checked with
+        a single lookup before soupsieve is consulted.
+
+        Parameters:
+            tag (Tag): The tag to check.
+
+        Returns:
+            bool: True if the tag should be removed.
+        """
+        if tag.name in self._removable_tag_names:
+            return True
+        return self._matches_compiled_selectors(tag)
+
+    def _matches_compiled_selectors(self, tag):
+        """
+        Check whether a tag matches the compiled (non tag-name) removal selectors.
+
+        Parameters:
+            tag (Tag): The tag to check.
+
+        Returns:
+            bool: True if the tag matches.
+        """
+        return self._compiled_selectors is not None and bool(
+            self._compiled_selectors.match(tag)
+        )
 
     def _strip_tags(self, soup):
         """
@@ -181,6 +269,33 @@ class HTMLToMarkdownConverter:
         Returns:
             None
         """
-        for tag in self.strip_tags:
-            for s in soup(tag):
-                s.decompose()
+        self._decompose_matching(soup, lambda tag: tag.name in self._strip_tag_names)
+
+    @staticmethod
+    def _decompose_matching(soup, predicate):
+        """
+        Decompose every tag in the given BeautifulSoup object for which the predicate
+        returns True, visiting each node at most once. Subtrees of matching tags are skipped.
+        Matches are only collected during the walk and decomposed afterwards, so positional
+        selectors such as :first-child see the original tree.
+
+        Parameters:
+            soup (BeautifulSoup): The BeautifulSoup object to walk.
+            predicate (callable): Called with each Tag; a truthy result removes the tag.
+
+        Returns:
+            None
+        """
+        matches = []
+        stack = [soup]
+        while stack:
+            node = stack.pop()
+            for child in node.contents:
+                if not isinstance(child, Tag):
+                    continue
+                if predicate(child):
+                    matches.append(child)
+                else:
+                    stack.append(child)
+        for tag in matches:
+            tag.decompose()
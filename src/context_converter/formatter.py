@@ -8,6 +8,7 @@ Classes:
 """
 
 import asyncio
+import hashlib
 from converter import HTMLToMarkdownConverter
 import logging
 
@@ -19,6 +20,8 @@ class DatasetFormatter:
     Attributes:
         converter (HTMLToMarkdownConverter): An instance of \
             HTMLToMarkdownConverter for HTML to Markdown conversion.
+        cache_size (int): Maximum number of converted HTML bodies \
+            kept for reuse by duplicate entries.
 
     Methods:
         format_entry(entry): Formats a single dataset entry into Markdown.
@@ -28,17 +31,20 @@ class DatasetFormatter:
             of entries into Markdown.
     """
 
-    def __init__(self, converter):
+    def __init__(self, converter, cache_size=1024):
         """
         Initializes the class with a converter object.
 
         Parameters:
             converter: The converter object to be used by the class.
+            cache_size: Maximum number of conversions cached by HTML digest. Defaults to 1024.
 
         Returns:
             None
         """
         self.converter = converter
+        self.cache_size = cache_size
+        self._markdown_cache = {}
 
     async def format_entry(self, entry):
         """
@@ -56,12 +62,39 @@ class DatasetFormatter:
             url = entry.get("url", "")
             html_content = entry.get("html", "")
             logging.info("Formatted entry: %s", title)
-            markdown_content = self.converter.convert(html_content)
+            markdown_content = self._convert_cached(html_content)
             return self.structure_markdown(title, url, markdown_content)
         except Exception as e:
             logging.error("Error formatting entry: %s", e)
             return ""
 
+    def _convert_cached(self, html_content):
+        """
+        Converts HTML content to Markdown, reusing the result when the same HTML was
+        already converted. Results are keyed on a BLAKE2b digest of the HTML, so the
+        cache does not hold the HTML itself; the oldest entry is evicted when full.
+        Empty or non-string HTML bypasses the cache and goes straight to the converter.
+
+        Args:
+            html_content: The HTML content to be converted
+
+        Returns:
+            The converted markdown content
+        """
+        if not html_content or not isinstance(html_content, str):
+            return self.converter.convert(html_content)
+        # surrogatepass keeps lone surrogates from scraped text hashable
+        key = hashlib.blake2b(
+            html_content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        markdown_content = self._markdown_cache.get(key)
+        if markdown_content is None:
+            markdown_content = self.converter.convert(html_content)
+            if len(self._markdown_cache) >= self.cache_size:
+                del self._markdown_cache[next(iter(self._markdown_cache))]
+            self._markdown_cache[key] = markdown_content
+        return markdown_content
+
     def structure_markdown(self, title, url, content):
         """
         Generates structured markdown content based on the provided title, URL, and content.
@@ -1,28 +1,70 @@
 """
 This module serves as the main entry point for the HTML to Markdown conversion project.
 
-It contains the main function which loads, processes, and saves the dataset. The processing involves converting HTML content to Markdown and formatting it into a structured form. The dataset is processed in chunks to optimize memory usage and performance.
+It contains the main function which loads, processes, and saves the dataset. The processing involves converting HTML content to Markdown and formatting it into a structured form. The dataset is streamed from disk and processed in chunks, so only a bounded number of chunks is held in memory at once.
 
-The module also includes functions for processing individual chunks of the dataset and for processing and collecting data from all chunks in parallel using multithreading.
+The module also includes functions for processing individual chunks of the dataset and for processing and collecting data from all chunks in parallel using a pool of worker processes.
 
 Functions:
+    init_worker(workers): Limits torch threads and builds the formatter in a pool worker.
+    get_formatter(): Returns the per-process DatasetFormatter, creating it on first use.
     process_dataset_chunk(chunk): Processes a single chunk of the dataset.
+    write_chunk_result(future, output_file): Waits for a processed chunk and appends it to the output file.
     main(): Main function to load, process, and save the dataset.
 """
 
 
 import logging
-from typing import List
+import os
+from collections import deque
+from typing import List, Optional
 import asyncio
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+import torch
 from converter import HTMLToMarkdownConverter
 from formatter import DatasetFormatter
-from utils import load_json_files, save_output_in_chunks, chunk_dataset
+from utils import (
+    stream_json_entries,
+    open_output_file,
+    save_output_in_chunks,
+    chunk_entries,
+)
+
+
+# One formatter per process, so the embedding model is loaded once per worker
+_formatter = None
+
+
+def get_formatter():
+    """
+    Return this process's DatasetFormatter, creating it on first use.
+
+    Returns:
+        DatasetFormatter: The formatter shared by every chunk handled in this process.
+    """
+    global _formatter
+    if _formatter is None:
+        _formatter = DatasetFormatter(HTMLToMarkdownConverter())
+    return _formatter
+
+
+def init_worker(workers):
+    """
+    Process pool initializer. Splits the CPU cores between the workers so each one's
+    torch intra-op thread pool does not oversubscribe the machine, then builds the
+    worker's formatter up front.
+
+    Args:
+        workers (int): The number of worker processes in the pool.
+    """
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+    get_formatter()
 
 
 def process_dataset_chunk(chunk):
     """
     Process a dataset chunk using a DatasetFormatter and return the formatted dataset.
+    Runs inside a worker process, so the formatter coroutine is driven by its own event loop.
     
     Args:
         chunk: The dataset chunk to be processed.
@@ -31,17 +73,34 @@ def process_dataset_chunk(chunk):
         The formatted dataset, or an empty string if an error occurs.
     """
     try:
-        formatter = DatasetFormatter(HTMLToMarkdownConverter())
-        return formatter.format_dataset(chunk)
+        return asyncio.run(get_formatter().format_dataset(chunk))
     except Exception as e:
         logging.error("Error processing dataset chunk: %s", e)
         return ""
 
 
+async def write_chunk_result(future, output_file):
+    """
+    Wait for a processed chunk and append its content to the output file.
+
+    Args:
+        future: The future of a process_dataset_chunk call.
+        output_file: The open output file.
+    """
+    try:
+        content = await future
+        await save_output_in_chunks(output_file, content)
+        logging.info("Conversion process successful. Exiting program.")
+    except Exception as e:
+        logging.error("An error occurred while processing a chunk: %s", e)
+        # Handle error or save progress here
+
+
 async def main(
     pattern: str = "output*.json",
     chunk_size: int = 256,
     output_file_name: str = "gpt-crawler-curated_markdown.md",
+    max_workers: Optional[int] = None,
 ) -> None:
     """
     Main function to load, process, and save the dataset.
@@ -49,22 +108,30 @@ async def main(
     :param pattern: Pattern to match JSON files.
     :param chunk_size: Size of chunks to split the dataset into.
     :param output_file_name: Name of the output file.
+    :param max_workers: Number of worker processes. Defaults to the number of CPUs.
     """
     logging.basicConfig(level=logging.INFO)
 
     try:
-        original_data = await load_json_files(pattern)
-
-        chunks = list(chunk_dataset(original_data, chunk_size))
-
-        for chunk in chunks:
-            try:
-                content = await process_dataset_chunk(chunk)
-                await save_output_in_chunks(output_file_name, content)
-                logging.info("Conversion process successful. Exiting program.")
-            except Exception as e:
-                logging.error("An error occurred while processing a chunk: %s", e)
-                # Handle error or save progress here
+        workers = max_workers or os.cpu_count()
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(workers,)
+        ) as executor:
+            async with open_output_file(output_file_name) as output_file:
+                # Results are written in submission order to keep dataset order
+                pending = deque()
+                async for chunk in chunk_entries(
+                    stream_json_entries(pattern), chunk_size
+                ):
+                    pending.append(
+                        loop.run_in_executor(executor, process_dataset_chunk, chunk)
+                    )
+                    # Keep at most two chunks per worker in flight to bound memory
+                    if len(pending) >= 2 * workers:
+                        await write_chunk_result(pending.popleft(), output_file)
+                while pending:
+                    await write_chunk_result(pending.popleft(), output_file)
     except Exception as e:
         logging.error("An error occurred in the main function: %s", e)
 
@@ -2,6 +2,8 @@ import glob
 import json
 import logging
 import aiofiles
+import ijson
+import orjson
 import asyncio
 from converter import HTMLToMarkdownConverter
 from formatter import DatasetFormatter
@@ -10,6 +12,8 @@ from formatter import DatasetFormatter
 async def load_json_files(pattern):
     """
     Asynchronously loads JSON files matching the given pattern and aggregates their data.
+    Kept for callers that want the whole dataset as a list; main() streams entries
+    with `stream_json_entries` instead so large inputs are never fully loaded.
 
     Args:
         pattern (str): The pattern to match JSON files.
@@ -20,35 +24,97 @@ async def load_json_files(pattern):
     try:
         aggregated_data = []
         for file_path in glob.glob(pattern):
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as file:
+            # orjson parses the raw UTF-8 bytes directly, skipping a decode pass
+            async with aiofiles.open(file_path, "rb") as file:
                 data = await file.read()
-                aggregated_data.extend(json.loads(data))
+            try:
+                entries = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # orjson rejects lone surrogate escapes and NaN/Infinity; stdlib accepts them
+                entries = json.loads(data)
+            aggregated_data.extend(entries)
         return aggregated_data
     except Exception as e:
         logging.error("Error loading JSON files: %s", e)
         return []
 
 
-async def save_output_in_chunks(file_path, contents):
+async def stream_json_entries(pattern):
     """
-    Asynchronously saves the given contents to the specified file path in chunks.
+    Asynchronously streams the entries of the top-level JSON arrays in files matching the
+    given pattern, one entry at a time, without reading whole files into memory.
 
     Args:
-        file_path (str): The path of the file to save the contents to.
+        pattern (str): The pattern to match JSON files.
+
+    Yields:
+        dict: Each entry of each matched file, in file order.
+    """
+    for file_path in glob.glob(pattern):
+        try:
+            async with aiofiles.open(file_path, "rb") as file:
+                async for entry in ijson.items(file, "item", use_float=True):
+                    yield entry
+        except Exception as e:
+            logging.error("Error streaming JSON file %s: %s", file_path, e)
+
+
+async def chunk_entries(entries, chunk_size):
+    """
+    Asynchronously groups streamed entries into lists of at most chunk_size entries.
+
+    Args:
+        entries: An async iterable of dataset entries.
+        chunk_size (int): The size of each chunk.
+
+    Yields:
+        list: The chunks of the dataset, the last one possibly shorter.
+    """
+    chunk = []
+    async for entry in entries:
+        chunk.append(entry)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def save_output_in_chunks(file, contents):
+    """
+    Asynchronously appends the given contents to an already open output file.
+
+    The file is expected to stay open for the whole run (see `open_output_file`), so
+    each chunk costs a single buffered write rather than an open/flush/close cycle.
+
+    Args:
+        file: The open aiofiles file object to write to.
         contents (str): The contents to be saved to the file.
 
     Returns:
         None
     """
     try:
-        async with aiofiles.open(file_path, "a", encoding="utf-8") as file:
-            await file.write(contents)
-            await file.flush()
-            logging.info("Flushed file content: %s", file_path)
+        await file.write(contents)
+        logging.info("Wrote chunk to file: %s", file.name)
     except Exception as e:
         logging.error("Error saving output in chunks: %s", e)
 
 
+def open_output_file(file_path, buffer_size=1 << 20):
+    """
+    Opens the output file for appending with a large write buffer.
+
+    Args:
+        file_path (str): The path of the file to save the contents to.
+        buffer_size (int, optional): The write buffer size in bytes. Defaults to 1 MiB.
+
+    Returns:
+        An aiofiles async context manager for the opened file.
+    """
+    return aiofiles.open(file_path, "a", encoding="utf-8", buffering=buffer_size)
+
+
 def chunk_dataset(data, chunk_size):
     """
     Function to chunk a dataset into smaller parts based on the given chunk size.
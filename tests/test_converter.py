@@ -6,14 +6,19 @@ import torch
 import logging
 import os
 import sys
+from unittest.mock import patch
 
-# Get the absolute path of the parent directory
-parent_dir = os.path.dirname(os.path.abspath(__file__))
+# Get the absolute path of the package source directory
+package_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "src",
+    "context_converter",
+)
 
-# Add the parent directory to the system path
-sys.path.append(parent_dir)
+# Add the package source directory to the system path; its modules import each other by name
+sys.path.insert(0, package_dir)
 
-from conv_html_to_markdown.converter import HTMLToMarkdownConverter
+from converter import HTMLToMarkdownConverter
 
 
 class HTMLToMarkdownConverterTest(unittest.TestCase):
@@ -42,6 +47,22 @@ class HTMLToMarkdownConverterTest(unittest.TestCase):
         self.converter._remove_selectors(soup)
         self.assertEqual(str(soup), expected_html)
 
+    def test_remove_custom_selectors(self):
+        converter = HTMLToMarkdownConverter(remove_selectors=[".promo"])
+        html = '<html><head></head><body><header>Header</header><div class="promo">Ad</div></body></html>'
+        expected_html = "<html><head></head><body><header>Header</header></body></html>"
+        soup = BeautifulSoup(html, "html.parser")
+        converter._remove_selectors(soup)
+        self.assertEqual(str(soup), expected_html)
+
+    def test_remove_positional_selectors(self):
+        converter = HTMLToMarkdownConverter(remove_selectors=["li:first-child"])
+        html = "<ul><li>1</li><li>2</li><li>3</li></ul>"
+        expected_html = "<ul><li>2</li><li>3</li></ul>"
+        soup = BeautifulSoup(html, "html.parser")
+        converter._remove_selectors(soup)
+        self.assertEqual(str(soup), expected_html)
+
     def test_strip_tags(self):
         html = "<html><head></head><body><script>Script</script></body></html>"
         expected_html = "<html><head></head><body></body></html>"
@@ -55,6 +76,61 @@ class HTMLToMarkdownConverterTest(unittest.TestCase):
         markdown_content = self.converter.convert(html)
         self.assertEqual(markdown_content, expected_markdown)
 
+    def test_convert_empty(self):
+        self.assertEqual(self.converter.convert(""), "")
+        self.assertEqual(self.converter.convert(" \n\t"), "")
+
+
+class CharTokenizer:
+    """Stand-in for the Hugging Face tokenizer: one token per character."""
+
+    def __call__(self, batch, padding=True, truncation=True, return_tensors="pt"):
+        width = max(1, max(len(line) for line in batch))
+        input_ids = torch.zeros(len(batch), width, dtype=torch.long)
+        attention_mask = torch.zeros(len(batch), width, dtype=torch.long)
+        for i, line in enumerate(batch):
+            for j, char in enumerate(line):
+                input_ids[i, j] = ord(char) % 128
+                attention_mask[i, j] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+def char_count_model(input_ids, attention_mask):
+    """Stand-in for the embedding model: one-hot token states, so mean pooling
+    yields each line's character frequencies."""
+    return (torch.nn.functional.one_hot(input_ids, 128).float(),)
+
+
+class HTMLToMarkdownConverterStubModelTest(unittest.TestCase):
+    def setUp(self):
+        with patch.object(
+            HTMLToMarkdownConverter,
+            "_initialize_embedding_model",
+            return_value=(CharTokenizer(), char_count_model),
+        ):
+            self.converter = HTMLToMarkdownConverter()
+
+    def test_convert_removes_redundant_lines(self):
+        html = (
+            "<ul><li>Python asyncio tutorial</li><li>Python asyncio tutorial!</li>"
+            "<li>Zebra crossing at 5pm</li></ul>"
+        )
+        expected_markdown = "* Python asyncio tutorial\n* Zebra crossing at 5pm"
+        self.assertEqual(self.converter.convert(html), expected_markdown)
+
+    def test_convert_unclosed_list_items(self):
+        # lxml closes each <li> at the next one; html.parser nested them into "* x* y"
+        html = "<ul><li>Python<li>Zebra</ul>"
+        expected_markdown = "* Python\n* Zebra"
+        self.assertEqual(self.converter.convert(html), expected_markdown)
+
+    def test_process_embeddings_independent_of_batch_size(self):
+        lines = ["* Python asyncio tutorial", "", "short", "* Zebra crossing at 5pm"]
+        single_batch = self.converter._process_embeddings(lines, batch_size=16)
+        several_batches = self.converter._process_embeddings(lines, batch_size=3)
+        self.assertEqual(single_batch.shape, (4, 128))
+        self.assertTrue(torch.allclose(single_batch, several_batches))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,18 +1,23 @@
-import asynctest
+import unittest
 import os
 import sys
+from unittest.mock import patch
 
-# Get the absolute path of the parent directory
-parent_dir = os.path.dirname(os.path.abspath(__file__))
+# Get the absolute path of the package source directory
+package_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "src",
+    "context_converter",
+)
 
-# Add the parent directory to the system path
-sys.path.append(parent_dir)
+# Add the package source directory to the system path; its modules import each other by name
+sys.path.insert(0, package_dir)
 
-from conv_html_to_markdown.converter import HTMLToMarkdownConverter
-from conv_html_to_markdown.formatter import DatasetFormatter
+from converter import HTMLToMarkdownConverter
+from formatter import DatasetFormatter
 
 
-class TestDatasetFormatter(asynctest.TestCase):
+class TestDatasetFormatter(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.converter = HTMLToMarkdownConverter()
         self.formatter = DatasetFormatter(self.converter)
@@ -28,6 +33,48 @@ class TestDatasetFormatter(asynctest.TestCase):
         result = await self.formatter.format_entry(entry)
         self.assertEqual(result, expected_markdown)
 
+    async def test_format_entry_reuses_duplicate_html(self):
+        entry = {
+            "title": "Test Title",
+            "url": "https://example.com/test-title",
+            "html": "<p>This is a test.</p>",
+        }
+        duplicate = dict(entry, title="Mirror", url="https://mirror.example.com/")
+        expected_markdown = (
+            "## Mirror\n\n[Read More](https://mirror.example.com/)\n\nThis is a test."
+        )
+        with patch.object(
+            self.converter, "convert", wraps=self.converter.convert
+        ) as convert:
+            await self.formatter.format_entry(entry)
+            result = await self.formatter.format_entry(duplicate)
+        self.assertEqual(convert.call_count, 1)
+        self.assertEqual(result, expected_markdown)
+
+    async def test_format_entry_lone_surrogate(self):
+        entry = {
+            "title": "Test Title",
+            "url": "https://example.com/test-title",
+            "html": "<p>a \ud83d</p>",
+        }
+        expected_markdown = (
+            "## Test Title\n\n[Read More](https://example.com/test-title)\n\na \ud83d"
+        )
+        result = await self.formatter.format_entry(entry)
+        self.assertEqual(result, expected_markdown)
+
+    async def test_format_entry_null_html(self):
+        entry = {
+            "title": "Test Title",
+            "url": "https://example.com/test-title",
+            "html": None,
+        }
+        expected_markdown = (
+            "## Test Title\n\n[Read More](https://example.com/test-title)\n\n"
+        )
+        result = await self.formatter.format_entry(entry)
+        self.assertEqual(result, expected_markdown)
+
     def test_structure_markdown(self):
         title = "Test Title"
         url = "https://example.com/test-title"
@@ -57,4 +104,4 @@ class TestDatasetFormatter(asynctest.TestCase):
 
 
 if __name__ == "__main__":
-    asynctest.main()
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import json
+import math
+import os
+import sys
+import tempfile
+
+# Get the absolute path of the package source directory
+package_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "src",
+    "context_converter",
+)
+
+# Add the package source directory to the system path; its modules import each other by name
+sys.path.insert(0, package_dir)
+
+from utils import chunk_entries, load_json_files, stream_json_entries
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(async_iterable):
+    return [item async for item in async_iterable]
+
+
+class TestChunkEntries(unittest.IsolatedAsyncioTestCase):
+    async def test_last_chunk_shorter(self):
+        chunks = await _collect(chunk_entries(_aiter(range(7)), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+
+    async def test_exact_multiple(self):
+        chunks = await _collect(chunk_entries(_aiter(range(4)), 2))
+        self.assertEqual(chunks, [[0, 1], [2, 3]])
+
+    async def test_empty_stream(self):
+        chunks = await _collect(chunk_entries(_aiter([]), 3))
+        self.assertEqual(chunks, [])
+
+
+class TestStreamJsonEntries(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.tmp_dir.name, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    async def test_streams_entries(self):
+        data = [{"title": "Test Title", "html": "<p>é</p>", "score": 0.5}]
+        self._write("output1.json", json.dumps(data))
+        entries = await _collect(
+            stream_json_entries(os.path.join(self.tmp_dir.name, "output*.json"))
+        )
+        self.assertEqual(entries, data)
+
+    async def test_malformed_file_is_skipped(self):
+        self._write("output1.json", "{not json")
+        self._write("output2.json", json.dumps([{"title": "Good"}]))
+        with self.assertLogs(level="ERROR") as logs:
+            entries = await _collect(
+                stream_json_entries(os.path.join(self.tmp_dir.name, "output*.json"))
+            )
+        self.assertEqual(entries, [{"title": "Good"}])
+        self.assertIn("output1.json", logs.output[0])
+
+
+class TestLoadJsonFiles(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.tmp_dir.name, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    async def test_loads_entries(self):
+        data = [{"title": "Test Title", "html": "<p>é</p>"}]
+        self._write("output1.json", json.dumps(data))
+        entries = await load_json_files(os.path.join(self.tmp_dir.name, "output*.json"))
+        self.assertEqual(entries, data)
+
+    async def test_lone_surrogate_and_nan_fall_back_to_json(self):
+        self._write("output1.json", '[{"html": "<p>a \\ud83d b</p>", "score": NaN}]')
+        entries = await load_json_files(os.path.join(self.tmp_dir.name, "output*.json"))
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["html"], "<p>a \ud83d b</p>")
+        self.assertTrue(math.isnan(entries[0]["score"]))
+
+
+if __name__ == "__main__":
+    unittest.main()